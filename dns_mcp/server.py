@@ -2,13 +2,28 @@
 
 import argparse
 import asyncio
+import ctypes
+import dataclasses
+import functools
+import ipaddress
+import math
 import os
 import platform
+import re
+import signal
 import socket
 import subprocess
 import sys
-from typing import Any, Dict, List, Optional, Union
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
+import dns.asyncresolver
+import dns.exception
+import dns.message
+import dns.name
+import dns.rdatatype
 import dns.resolver
 from fastmcp import FastMCP
 
@@ -16,50 +31,190 @@ from fastmcp import FastMCP
 mcp = FastMCP("DNS MCP Server")
 
 
+# Lowercased platform name, e.g. "windows", "linux" or "darwin" (macOS)
+_SYSTEM = platform.system().lower()
+
+
 def get_system_dns_servers() -> List[str]:
-    """Get system DNS servers for cross-platform support."""
-    system = platform.system().lower()
-    
-    if system == "windows":
-        return _get_windows_dns_servers()
-    elif system == "linux":
-        return _get_linux_dns_servers()
-    elif system == "darwin":  # macOS
-        return _get_macos_dns_servers()
-    else:
+    """Get system DNS servers for cross-platform support.
+    
+    Discovery runs once per process; later calls return the same servers.
+    Use refresh_system_dns_servers() to pick up configuration changes.
+    """
+    return list(_discover_system_dns_servers())
+
+
+def refresh_system_dns_servers() -> List[str]:
+    """Discover the system DNS servers again and apply them to the server.
+    
+    The global dns_tool switches to the new servers only when it was created
+    without explicitly configured upstream servers.
+    
+    Returns:
+        The newly discovered system DNS servers
+    """
+    servers = _rediscover_system_dns_servers()
+    if dns_tool is not None and dns_tool.uses_system_servers:
+        dns_tool.set_upstream_servers(servers)
+    return servers
+
+
+def _rediscover_system_dns_servers() -> List[str]:
+    """Forget the remembered system DNS servers and discover them again."""
+    _discover_system_dns_servers.cache_clear()
+    return get_system_dns_servers()
+
+
+@functools.lru_cache(maxsize=1)
+def _discover_system_dns_servers() -> Tuple[str, ...]:
+    """Run the platform specific DNS server discovery once per process."""
+    discover = _DNS_DISCOVERY.get(_SYSTEM)
+    if discover is None:
         # Fallback to common public DNS servers
-        return ["8.8.8.8", "8.8.4.4"]
+        return ("8.8.8.8", "8.8.4.4")
+    return tuple(discover())
+
+
+# Flags and constants for GetAdaptersAddresses (iphlpapi.h)
+_GAA_FLAG_SKIP_UNICAST = 0x0001
+_GAA_FLAG_SKIP_ANYCAST = 0x0002
+_GAA_FLAG_SKIP_MULTICAST = 0x0004
+_GAA_FLAG_SKIP_FRIENDLY_NAME = 0x0020
+_AF_UNSPEC = 0
+_AF_INET = 2
+_AF_INET6_WINDOWS = 23
+_ERROR_BUFFER_OVERFLOW = 111
+_IF_OPER_STATUS_UP = 1
+
+
+class _SocketAddress(ctypes.Structure):
+    """SOCKET_ADDRESS from ws2def.h."""
+    _fields_ = [
+        ("lpSockaddr", ctypes.c_void_p),
+        ("iSockaddrLength", ctypes.c_int),
+    ]
+
+
+class _IPAdapterDnsServerAddress(ctypes.Structure):
+    """IP_ADAPTER_DNS_SERVER_ADDRESS from iptypes.h."""
+
+
+_IPAdapterDnsServerAddress._fields_ = [
+    ("Length", ctypes.c_ulong),
+    ("Reserved", ctypes.c_ulong),
+    ("Next", ctypes.POINTER(_IPAdapterDnsServerAddress)),
+    ("Address", _SocketAddress),
+]
+
+
+class _IPAdapterAddresses(ctypes.Structure):
+    """Leading fields of IP_ADAPTER_ADDRESSES from iptypes.h, up to OperStatus."""
+
+
+_IPAdapterAddresses._fields_ = [
+    ("Length", ctypes.c_ulong),
+    ("IfIndex", ctypes.c_ulong),
+    ("Next", ctypes.POINTER(_IPAdapterAddresses)),
+    ("AdapterName", ctypes.c_char_p),
+    ("FirstUnicastAddress", ctypes.c_void_p),
+    ("FirstAnycastAddress", ctypes.c_void_p),
+    ("FirstMulticastAddress", ctypes.c_void_p),
+    ("FirstDnsServerAddress", ctypes.POINTER(_IPAdapterDnsServerAddress)),
+    ("DnsSuffix", ctypes.c_wchar_p),
+    ("Description", ctypes.c_wchar_p),
+    ("FriendlyName", ctypes.c_wchar_p),
+    ("PhysicalAddress", ctypes.c_ubyte * 8),
+    ("PhysicalAddressLength", ctypes.c_ulong),
+    ("Flags", ctypes.c_ulong),
+    ("Mtu", ctypes.c_ulong),
+    ("IfType", ctypes.c_ulong),
+    ("OperStatus", ctypes.c_int),
+]
 
 
 def _get_windows_dns_servers() -> List[str]:
     """Get DNS servers on Windows."""
     try:
-        # Use nslookup to get current DNS servers
-        result = subprocess.run(
-            ["nslookup", "localhost"],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        
-        dns_servers = []
-        for line in result.stdout.split('\n'):
-            if 'Address:' in line:
-                server = line.split(':')[-1].strip()
-                if server and server != "localhost":
-                    dns_servers.append(server)
-        
+        dns_servers = _get_windows_adapter_dns_servers()
         if dns_servers:
             return dns_servers
-    except (subprocess.TimeoutExpired, subprocess.SubprocessError, FileNotFoundError):
+    except (AttributeError, OSError):
         pass
     
     # Fallback to public DNS
     return ["8.8.8.8", "8.8.4.4"]
 
 
-def _get_linux_dns_servers() -> List[str]:
-    """Get DNS servers on Linux."""
+def _get_windows_adapter_dns_servers() -> List[str]:
+    """Read the DNS servers of all active adapters via GetAdaptersAddresses."""
+    get_adapters_addresses = ctypes.windll.iphlpapi.GetAdaptersAddresses
+    get_adapters_addresses.restype = ctypes.c_ulong
+    flags = (
+        _GAA_FLAG_SKIP_UNICAST
+        | _GAA_FLAG_SKIP_ANYCAST
+        | _GAA_FLAG_SKIP_MULTICAST
+        | _GAA_FLAG_SKIP_FRIENDLY_NAME
+    )
+    
+    # Retry with the size the API asks for if adapters changed in between
+    size = ctypes.c_ulong(15000)
+    for _ in range(3):
+        buffer = ctypes.create_string_buffer(size.value)
+        ret = get_adapters_addresses(_AF_UNSPEC, flags, None, buffer, ctypes.byref(size))
+        if ret != _ERROR_BUFFER_OVERFLOW:
+            break
+    if ret != 0:
+        return []
+    
+    dns_servers = []
+    adapter = ctypes.cast(buffer, ctypes.POINTER(_IPAdapterAddresses))
+    while adapter:
+        if adapter.contents.OperStatus == _IF_OPER_STATUS_UP:
+            entry = adapter.contents.FirstDnsServerAddress
+            while entry:
+                server = _sockaddr_to_ip(entry.contents.Address)
+                if server:
+                    dns_servers.append(server)
+                entry = entry.contents.Next
+        adapter = adapter.contents.Next
+    
+    return _unique_ips(dns_servers)
+
+
+def _sockaddr_to_ip(address: _SocketAddress) -> Optional[str]:
+    """Convert a Windows SOCKET_ADDRESS to an IP address string."""
+    if not address.lpSockaddr:
+        return None
+    raw = ctypes.string_at(address.lpSockaddr, address.iSockaddrLength)
+    family = int.from_bytes(raw[:2], "little")
+    
+    if family == _AF_INET and len(raw) >= 8:
+        # sockaddr_in: family, port, 4 byte address
+        return str(ipaddress.IPv4Address(raw[4:8]))
+    if family == _AF_INET6_WINDOWS and len(raw) >= 24:
+        # sockaddr_in6: family, port, flowinfo, 16 byte address
+        ip = ipaddress.IPv6Address(raw[8:24])
+        # fec0:0:0:ffff::1-3 are placeholders Windows reports for
+        # adapters without configured IPv6 DNS servers
+        if not ip.is_site_local:
+            return str(ip)
+    return None
+
+
+def _unique_ips(candidates: Iterable[str]) -> List[str]:
+    """Return the valid IPv4/IPv6 addresses in candidates, deduplicated in order."""
+    seen: Dict[str, None] = {}
+    for server in candidates:
+        try:
+            ipaddress.ip_address(server)
+        except ValueError:
+            continue
+        seen.setdefault(server, None)
+    return list(seen)
+
+
+def _read_resolv_conf() -> List[str]:
+    """Read nameserver entries from /etc/resolv.conf."""
     try:
         with open('/etc/resolv.conf', 'r') as f:
             dns_servers = []
@@ -69,20 +224,28 @@ def _get_linux_dns_servers() -> List[str]:
                     parts = line.split()
                     if len(parts) >= 2:
                         dns_servers.append(parts[1])
-            
-            if dns_servers:
-                return dns_servers
+            return _unique_ips(dns_servers)
     except (FileNotFoundError, PermissionError):
-        pass
+        return []
+
+
+def _get_linux_dns_servers() -> List[str]:
+    """Get DNS servers on Linux."""
+    dns_servers = _read_resolv_conf()
+    if dns_servers:
+        return dns_servers
     
     # Fallback to public DNS
     return ["8.8.8.8", "8.8.4.4"]
 
 
+# Matches lines like "nameserver[0] : 8.8.8.8" in `scutil --dns` output
+_SCUTIL_NAMESERVER_RE = re.compile(r"nameserver\[\d+\]\s*:\s*(\S+)")
+
+
 def _get_macos_dns_servers() -> List[str]:
     """Get DNS servers on macOS."""
     try:
-        # Try using scutil first (more reliable on macOS)
         result = subprocess.run(
             ["scutil", "--dns"],
             capture_output=True,
@@ -90,65 +253,7 @@ def _get_macos_dns_servers() -> List[str]:
             timeout=5
         )
         
-        dns_servers = []
-        for line in result.stdout.split('\n'):
-            line = line.strip()
-            if 'nameserver[0]' in line or 'nameserver[1]' in line:
-                # Extract IP address from lines like "nameserver[0] : 8.8.8.8"
-                parts = line.split(':')
-                if len(parts) >= 2:
-                    server = parts[-1].strip()
-                    if server and server not in dns_servers:
-                        dns_servers.append(server)
-        
-        if dns_servers:
-            return dns_servers
-            
-    except (subprocess.TimeoutExpired, subprocess.SubprocessError, FileNotFoundError):
-        pass
-    
-    try:
-        # Fallback to networksetup command
-        result = subprocess.run(
-            ["networksetup", "-getdnsservers", "Wi-Fi"],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        
-        dns_servers = []
-        for line in result.stdout.split('\n'):
-            line = line.strip()
-            if line and line != "There aren't any DNS Servers set on Wi-Fi.":
-                # Check if it's a valid IP address format
-                parts = line.split('.')
-                if len(parts) == 4 and all(part.isdigit() for part in parts):
-                    dns_servers.append(line)
-        
-        if dns_servers:
-            return dns_servers
-            
-    except (subprocess.TimeoutExpired, subprocess.SubprocessError, FileNotFoundError):
-        pass
-    
-    try:
-        # Also try Ethernet interface
-        result = subprocess.run(
-            ["networksetup", "-getdnsservers", "Ethernet"],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        
-        dns_servers = []
-        for line in result.stdout.split('\n'):
-            line = line.strip()
-            if line and line != "There aren't any DNS Servers set on Ethernet.":
-                # Check if it's a valid IP address format
-                parts = line.split('.')
-                if len(parts) == 4 and all(part.isdigit() for part in parts):
-                    dns_servers.append(line)
-        
+        dns_servers = _unique_ips(_SCUTIL_NAMESERVER_RE.findall(result.stdout))
         if dns_servers:
             return dns_servers
             
@@ -156,46 +261,231 @@ def _get_macos_dns_servers() -> List[str]:
         pass
     
     # Fallback to reading /etc/resolv.conf on macOS
-    try:
-        with open('/etc/resolv.conf', 'r') as f:
-            dns_servers = []
-            for line in f:
-                line = line.strip()
-                if line.startswith('nameserver'):
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        dns_servers.append(parts[1])
-            
-            if dns_servers:
-                return dns_servers
-    except (FileNotFoundError, PermissionError):
-        pass
+    dns_servers = _read_resolv_conf()
+    if dns_servers:
+        return dns_servers
     
     # Final fallback to public DNS
     return ["8.8.8.8", "8.8.4.4"]
 
 
+_DNS_DISCOVERY: Dict[str, Callable[[], List[str]]] = {
+    "windows": _get_windows_dns_servers,
+    "linux": _get_linux_dns_servers,
+    "darwin": _get_macos_dns_servers,
+}
+
+
+def _rdata_to_text(rdata: Any) -> str:
+    """Format a record in its zone file presentation form."""
+    return rdata.to_text()
+
+
+# Convert rdata objects to JSON friendly values, per record type.
+# Types not listed here are formatted with _rdata_to_text.
+_RECORD_FORMATTERS: Dict[str, Callable[[Any], Any]] = {
+    "A": _rdata_to_text,
+    "AAAA": _rdata_to_text,
+    "CNAME": lambda rdata: rdata.target.to_text(),
+    "NS": lambda rdata: rdata.target.to_text(),
+    "MX": lambda rdata: {
+        "priority": rdata.preference,
+        "exchange": rdata.exchange.to_text()
+    },
+    "TXT": lambda rdata: b" ".join(rdata.strings).decode("utf-8", "replace"),
+    "SOA": lambda rdata: {
+        "mname": rdata.mname.to_text(),
+        "rname": rdata.rname.to_text(),
+        "serial": rdata.serial,
+        "refresh": rdata.refresh,
+        "retry": rdata.retry,
+        "expire": rdata.expire,
+        "minimum": rdata.minimum
+    },
+}
+
+
+# How long to cache NXDOMAIN/NoAnswer results when the response has no SOA
+_NEGATIVE_CACHE_TTL = 30
+
+
+def _negative_ttl(response: Optional[dns.message.Message]) -> int:
+    """Return how long a negative answer may be cached (RFC 2308, section 5).
+    
+    This is the smaller of the SOA record's TTL and its MINIMUM field, taken
+    from the authority section of the response.
+    """
+    if response is not None:
+        for rrset in response.authority:
+            if rrset.rdtype == dns.rdatatype.SOA and len(rrset) > 0:
+                return min(rrset.ttl, rrset[0].minimum)
+    return _NEGATIVE_CACHE_TTL
+
+
+def _normalize_host(host: str) -> str:
+    """Normalize a hostname to its lowercase ASCII (IDNA) form.
+    
+    Surrounding whitespace and a single trailing dot are removed, so spellings
+    like "Example.COM." and "example.com" map to the same query and cache
+    entry. Internationalized names are encoded the same way dnspython encodes
+    them for the query (IDNA 2008 when the idna package is installed).
+    
+    Raises:
+        ValueError: If host is empty or not a valid hostname.
+    """
+    name = host.strip()
+    if name.endswith("."):
+        name = name[:-1]
+    if not name:
+        raise ValueError("Hostname is empty")
+    if name.endswith("."):
+        raise ValueError(f"Invalid hostname: {host!r}")
+    try:
+        return dns.name.from_text(name).to_text(omit_final_dot=True).lower()
+    except dns.exception.DNSException:
+        raise ValueError(f"Invalid hostname: {host!r}") from None
+
+
+@dataclass(slots=True)
+class DNSResult:
+    """Result of a single DNS query."""
+    
+    host: str
+    type: str
+    success: bool
+    records: List[Any] = field(default_factory=list)
+    ttl: Optional[int] = None
+    error: Optional[str] = None
+    upstream_servers: Optional[List[str]] = None
+    
+    def copy(self) -> "DNSResult":
+        """Return a copy that shares no mutable lists or dicts with this result."""
+        return dataclasses.replace(
+            self,
+            records=[dict(r) if isinstance(r, dict) else r for r in self.records],
+            upstream_servers=(
+                list(self.upstream_servers) if self.upstream_servers is not None else None
+            ),
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the dictionary returned by the dns_query tool.
+        
+        Fields that do not apply to the result (ttl on failure, error on
+        success) are left out rather than set to None.
+        """
+        result: Dict[str, Any] = {
+            "host": self.host,
+            "type": self.type,
+            "success": self.success,
+        }
+        if self.error is not None:
+            result["error"] = self.error
+        result["records"] = self.records
+        if self.ttl is not None:
+            result["ttl"] = self.ttl
+        if self.upstream_servers is not None:
+            result["upstream_servers"] = self.upstream_servers
+        return result
+
+
 class DNSQueryTool:
     """DNS query tool for MCP server."""
     
-    def __init__(self, upstream_servers: Optional[List[str]] = None):
+    __slots__ = (
+        "upstream_servers",
+        "uses_system_servers",
+        "cache_ttl_max",
+        "cache_size",
+        "resolver",
+        "_cache",
+        "_inflight",
+    )
+    
+    def __init__(
+        self,
+        upstream_servers: Optional[List[str]] = None,
+        cache_ttl_max: int = 300,
+        cache_size: int = 1024,
+    ):
         """Initialize DNS query tool.
         
         Args:
             upstream_servers: List of upstream DNS servers to use.
                             If None, will use system default.
+            cache_ttl_max: Upper bound in seconds for how long an answer is
+                           cached, regardless of its record TTL. 0 disables caching.
+            cache_size: Maximum number of cached answers. 0 disables caching.
         """
+        self.uses_system_servers = not upstream_servers
         self.upstream_servers = upstream_servers or get_system_dns_servers()
+        self.cache_ttl_max = cache_ttl_max
+        self.cache_size = cache_size
+        self._inflight: Dict[Tuple[str, str], "asyncio.Future[DNSResult]"] = {}
+        self._configure_resolver()
+    
+    def set_upstream_servers(self, upstream_servers: List[str]):
+        """Switch to new upstream DNS servers.
+        
+        Answers cached from the previous servers are discarded. Lookups still
+        running against them finish for their current callers, but later
+        queries do not join them and their answers are not cached.
+        """
+        self.upstream_servers = list(upstream_servers)
+        self._inflight.clear()
         self._configure_resolver()
     
     def _configure_resolver(self):
         """Configure the DNS resolver with upstream servers."""
-        self.resolver = dns.resolver.Resolver(configure=False)
+        self.resolver = dns.asyncresolver.Resolver(configure=False)
         self.resolver.nameservers = self.upstream_servers
-        self.resolver.timeout = 10
-        self.resolver.lifetime = 30
+        # Give up on a single server after 2s and on the whole query after 6s,
+        # trying the next server when one answers SERVFAIL
+        self.resolver.timeout = 2
+        self.resolver.lifetime = 6
+        self.resolver.retry_servfail = True
+        # Advertise a larger UDP payload with EDNS0 so big answers (TXT, NS)
+        # rarely come back truncated and have to be retried over TCP.
+        # 1232 bytes fits in a single unfragmented packet on common links.
+        self.resolver.use_edns(0, 0, 1232)
+        # Spread queries across all upstream servers
+        self.resolver.rotate = True
+        
+        # Answers are only valid for the servers they came from, so the cache
+        # is reset together with the resolver.
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[float, DNSResult]]" = OrderedDict()
+    
+    def _cache_get(self, key: Tuple[str, str]) -> Optional[DNSResult]:
+        """Return a cached result for key, or None if missing or expired."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expiry, result = entry
+        remaining = expiry - time.monotonic()
+        if remaining <= 0:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        
+        # Hand out a copy so callers cannot modify the cached entry, and
+        # report the remaining lifetime, like a caching resolver would
+        result = result.copy()
+        if result.ttl is not None:
+            result.ttl = math.ceil(remaining)
+        return result
+    
+    def _cache_put(self, key: Tuple[str, str], result: DNSResult, ttl: int):
+        """Cache a result for at most min(ttl, cache_ttl_max) seconds."""
+        ttl = min(ttl, self.cache_ttl_max)
+        if ttl <= 0 or self.cache_size <= 0:
+            return
+        
+        self._cache[key] = (time.monotonic() + ttl, result.copy())
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
     
-    async def query(self, host: str, record_type: str = 'A') -> Dict[str, Any]:
+    async def query(self, host: str, record_type: str = 'A') -> DNSResult:
         """Query DNS record for a host.
         
         Args:
@@ -203,100 +493,135 @@ class DNSQueryTool:
             record_type: The DNS record type (A, AAAA, MX, CNAME, TXT, NS, etc.)
         
         Returns:
-            Dictionary containing query results
+            DNSResult describing the answer or the failure
         """
         record_type = record_type.upper()
-        
         try:
-            # Perform DNS query in a thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None, 
-                self._sync_query, 
-                host, 
-                record_type
-            )
-            return result
-        except Exception as e:
-            return {
-                "host": host,
-                "type": record_type,
-                "success": False,
-                "error": str(e),
-                "records": []
-            }
-    
-    def _sync_query(self, host: str, record_type: str) -> Dict[str, Any]:
-        """Synchronous DNS query."""
+            host = _normalize_host(host)
+        except ValueError as e:
+            return DNSResult(host=host, type=record_type, success=False, error=str(e))
+        
+        # An IP literal is its own A/AAAA answer, no need to ask upstream
+        if record_type in ("A", "AAAA"):
+            try:
+                ip = ipaddress.ip_address(host)
+            except ValueError:
+                pass
+            else:
+                if record_type == ("A" if ip.version == 4 else "AAAA"):
+                    return DNSResult(
+                        host=host,
+                        type=record_type,
+                        success=True,
+                        records=[str(ip)],
+                        ttl=0
+                    )
+                return DNSResult(
+                    host=host,
+                    type=record_type,
+                    success=False,
+                    error=f"No {record_type} record found"
+                )
+        
+        key = (host, record_type)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        # Concurrent callers asking the same question share one lookup.
+        # The lookup runs as its own task so that a cancelled caller does
+        # not cancel it for the others.
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._lookup(host, record_type))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._forget_inflight(key, task))
+        
+        result = await asyncio.shield(task)
+        return result.copy()
+    
+    def _forget_inflight(self, key: Tuple[str, str], task: "asyncio.Future[DNSResult]"):
+        """Remove a finished lookup, unless a newer one replaced it already."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+    
+    async def warmup(self, hosts: List[str]):
+        """Prefetch the A and AAAA records of hosts into the cache in parallel."""
+        await asyncio.gather(*(
+            self.query(host, record_type)
+            for host in hosts
+            for record_type in ("A", "AAAA")
+        ))
+    
+    async def _lookup(self, host: str, record_type: str) -> DNSResult:
+        """Resolve a single DNS query and build its result.
+        
+        The result names, and is only cached for, the upstream servers that
+        were configured when the lookup started.
+        """
+        resolver = self.resolver
+        upstream_servers = self.upstream_servers
+        
+        def cache_result(result: DNSResult, ttl: int):
+            # Servers changed while the lookup ran; the answer is stale
+            if self.resolver is resolver:
+                self._cache_put((host, record_type), result, ttl)
+        
         try:
-            answer = self.resolver.resolve(host, record_type)
+            answer = await resolver.resolve(host, record_type, search=False)
             
-            records = []
-            for rdata in answer:
-                if record_type == 'A':
-                    records.append(str(rdata))
-                elif record_type == 'AAAA':
-                    records.append(str(rdata))
-                elif record_type == 'MX':
-                    records.append({
-                        "priority": rdata.preference,
-                        "exchange": str(rdata.exchange)
-                    })
-                elif record_type == 'CNAME':
-                    records.append(str(rdata.target))
-                elif record_type == 'TXT':
-                    records.append(' '.join([s.decode() if isinstance(s, bytes) else str(s) for s in rdata.strings]))
-                elif record_type == 'NS':
-                    records.append(str(rdata.target))
-                elif record_type == 'SOA':
-                    records.append({
-                        "mname": str(rdata.mname),
-                        "rname": str(rdata.rname),
-                        "serial": rdata.serial,
-                        "refresh": rdata.refresh,
-                        "retry": rdata.retry,
-                        "expire": rdata.expire,
-                        "minimum": rdata.minimum
-                    })
-                else:
-                    records.append(str(rdata))
+            format_record = _RECORD_FORMATTERS.get(record_type, _rdata_to_text)
+            records = [format_record(rdata) for rdata in answer]
             
-            return {
-                "host": host,
-                "type": record_type,
-                "success": True,
-                "records": records,
-                "ttl": answer.ttl,
-                "upstream_servers": self.upstream_servers
-            }
+            result = DNSResult(
+                host=host,
+                type=record_type,
+                success=True,
+                records=records,
+                ttl=answer.ttl,
+                upstream_servers=upstream_servers
+            )
+            cache_result(result, answer.ttl)
+            return result
             
-        except dns.resolver.NXDOMAIN:
-            return {
-                "host": host,
-                "type": record_type,
-                "success": False,
-                "error": "Domain does not exist (NXDOMAIN)",
-                "records": [],
-                "upstream_servers": self.upstream_servers
-            }
-        except dns.resolver.NoAnswer:
-            return {
-                "host": host,
-                "type": record_type,
-                "success": False,
-                "error": f"No {record_type} record found",
-                "records": [],
-                "upstream_servers": self.upstream_servers
-            }
+        except dns.resolver.NXDOMAIN as e:
+            result = DNSResult(
+                host=host,
+                type=record_type,
+                success=False,
+                error="Domain does not exist (NXDOMAIN)",
+                upstream_servers=upstream_servers
+            )
+            responses = e.kwargs.get("responses") or {}
+            response = next(iter(responses.values()), None)
+            cache_result(result, _negative_ttl(response))
+            return result
+        except dns.resolver.NoAnswer as e:
+            result = DNSResult(
+                host=host,
+                type=record_type,
+                success=False,
+                error=f"No {record_type} record found",
+                upstream_servers=upstream_servers
+            )
+            response = e.kwargs.get("response")
+            cache_result(result, _negative_ttl(response))
+            return result
         except dns.resolver.Timeout:
-            return {
-                "host": host,
-                "type": record_type,
-                "success": False,
-                "error": "DNS query timeout",
-                "records": [],
-                "upstream_servers": self.upstream_servers
-            }
+            return DNSResult(
+                host=host,
+                type=record_type,
+                success=False,
+                error="DNS query timeout",
+                upstream_servers=upstream_servers
+            )
+        except Exception as e:
+            return DNSResult(
+                host=host,
+                type=record_type,
+                success=False,
+                error=str(e)
+            )
 
 
 # Global DNS tool instance
@@ -326,7 +651,8 @@ async def dns_query(host: str, type: str = "A") -> Dict[str, Any]:
     if dns_tool is None:
         raise RuntimeError("DNS tool not initialized")
     
-    return await dns_tool.query(host, type)
+    result = await dns_tool.query(host, type)
+    return result.to_dict()
 
 
 def parse_args() -> argparse.Namespace:
@@ -343,22 +669,41 @@ def parse_args() -> argparse.Namespace:
         default=3000,
         help="Port to run the MCP server on (default: 3000)"
     )
+    parser.add_argument(
+        "--cache-ttl-max",
+        type=int,
+        default=300,
+        help="Maximum time in seconds to cache a DNS answer (default: 300, 0 disables caching)"
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=1024,
+        help="Maximum number of cached DNS answers (default: 1024, 0 disables caching)"
+    )
+    parser.add_argument(
+        "--warmup-hosts",
+        help="Comma-separated hostnames whose A/AAAA records are prefetched into the cache at startup"
+    )
     
     return parser.parse_args()
 
 
-def get_upstream_servers(args: argparse.Namespace) -> List[str]:
-    """Get upstream DNS servers from environment variable or command line args."""
-    # Priority: 1. Command line args, 2. Environment variable, 3. System default
+def _configured_upstream_servers(args: argparse.Namespace) -> Optional[List[str]]:
+    """Get upstream DNS servers from environment variable or command line args.
     
+    Returns None when neither is set, in which case DNSQueryTool falls back
+    to the system DNS servers.
+    """
+    # Priority: 1. Command line args, 2. Environment variable, 3. System default
     if args.dns_servers:
         return args.dns_servers
     
     env_servers = os.environ.get("DNS_MCP_SERVERS")
     if env_servers:
-        return [s.strip() for s in env_servers.split(",") if s.strip()]
+        return [s.strip() for s in env_servers.split(",") if s.strip()] or None
     
-    return get_system_dns_servers()
+    return None
 
 
 def main():
@@ -366,19 +711,71 @@ def main():
     global dns_tool
     
     args = parse_args()
-    upstream_servers = get_upstream_servers(args)
+    
+    # Initialize DNS tool; without configured servers it uses the system ones
+    dns_tool = DNSQueryTool(
+        _configured_upstream_servers(args),
+        cache_ttl_max=args.cache_ttl_max,
+        cache_size=args.cache_size,
+    )
     
     print(f"Starting DNS MCP Server...")
-    print(f"Upstream DNS servers: {upstream_servers}")
+    print(f"Upstream DNS servers: {dns_tool.upstream_servers}")
     print(f"Platform: {platform.system()}")
-    if platform.system().lower() == "darwin":
-        print("macOS DNS detection using scutil and networksetup commands")
+    if _SYSTEM == "darwin":
+        print("macOS DNS detection using scutil --dns")
     
-    # Initialize DNS tool
-    dns_tool = DNSQueryTool(upstream_servers)
+    warmup_hosts = []
+    if args.warmup_hosts:
+        warmup_hosts = [h.strip() for h in args.warmup_hosts.split(",") if h.strip()]
+        # stdout carries the MCP stdio protocol, so report on stderr
+        print(f"Warming up DNS cache for {len(warmup_hosts)} hosts", file=sys.stderr)
+    
+    # Prefer uvloop's faster event loop where it is installed (not on Windows)
+    try:
+        import uvloop
+    except ImportError:
+        run = asyncio.run
+    else:
+        run = uvloop.run
+    
+    run(_serve(warmup_hosts))
+
+
+async def _serve(warmup_hosts: List[str]):
+    """Run the MCP server over stdio, warming up the DNS cache alongside."""
+    # Keep references to background tasks so they are not garbage collected
+    background_tasks = set()
+    
+    def start_background_task(coro):
+        task = asyncio.create_task(coro)
+        background_tasks.add(task)
+        task.add_done_callback(background_tasks.discard)
+    
+    # Reload the system DNS servers on SIGHUP (not available on Windows)
+    if dns_tool.uses_system_servers and hasattr(signal, "SIGHUP"):
+        asyncio.get_running_loop().add_signal_handler(
+            signal.SIGHUP,
+            lambda: start_background_task(_reload_system_dns_servers())
+        )
+    
+    # Prefetch well-known hosts in the background so their first queries are
+    # served from cache; queries arriving earlier join the same lookups
+    if warmup_hosts:
+        start_background_task(dns_tool.warmup(warmup_hosts))
     
     # Run the server
-    mcp.run(transport="stdio")
+    await mcp.run_async(transport="stdio")
+
+
+async def _reload_system_dns_servers():
+    """Rediscover the system DNS servers and switch dns_tool to them.
+    
+    Discovery may run a subprocess (scutil on macOS), so it runs in a worker
+    thread; the resolver and cache are only replaced on the event loop.
+    """
+    servers = await asyncio.to_thread(_rediscover_system_dns_servers)
+    dns_tool.set_upstream_servers(servers)
 
 
 def cli_main():
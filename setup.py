@@ -10,8 +10,9 @@ setup(
     author_email="pccr10001@gmail.com",
     packages=find_packages(),
     install_requires=[
-        "fastmcp>=0.3.0",
+        "fastmcp>=2.0.0",
         "dnspython>=2.4.0",
+        "uvloop>=0.19; platform_system != 'Windows'",
     ],
     entry_points={
         "console_scripts": [